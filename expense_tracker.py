@@ -1,14 +1,51 @@
-import threading
 import json
+import os
+import sqlite3
+import sys
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional
 
 # -----------------------------
-# Data Storage (Python Dictionary)
+# Data Storage (SQLite)
 # -----------------------------
-expenses: List[Dict] = []
-
-DATA_FILE = "expenses.json"
+DB_FILE = "expenses.db"
+# File written by earlier versions; imported once into a new database
+LEGACY_DATA_FILE = "expenses.json"
+
+conn: Optional[sqlite3.Connection] = None
+
+# Set by --bulk: add_expense reads one "date,amount,category,description" line
+BULK_MODE = False
+IMPORT_BATCH_SIZE = 1000  # rows per transaction when importing from stdin
+
+# Running totals, loaded once at startup and updated on every insert.
+# Category keys are interned, so every expense in a category shares one
+# string object and dict lookups match on identity first.
+_category_totals: Dict[str, float] = defaultdict(float)
+_overall_total = 0.0
+# PRAGMA data_version when the totals were loaded; it changes when another
+# connection (e.g. a separate --import run) commits, making the totals stale
+_totals_version: Optional[int] = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    amount REAL NOT NULL,
+    category TEXT NOT NULL,
+    category_key TEXT NOT NULL,  -- category.lower(), computed once at insert
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_date ON expenses(date);
+CREATE INDEX IF NOT EXISTS idx_cat_key ON expenses(category_key);
+"""
+
+# sqlite3 caches the prepared statement for each distinct SQL string
+INSERT_SQL = (
+    "INSERT INTO expenses (date, amount, category, category_key, description) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
 
 
 # -----------------------------
@@ -16,27 +53,125 @@ DATA_FILE = "expenses.json"
 # -----------------------------
 def parse_date(date_str: str) -> datetime:
     """Convert string to datetime object"""
+    # Slice the canonical YYYY-MM-DD form directly; strptime's generic
+    # format parser is much slower and only needed for other spellings
+    if (len(date_str) == 10 and date_str.isascii() and date_str[4] == "-" and date_str[7] == "-"
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:].isdigit()):
+        return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
     return datetime.strptime(date_str, "%Y-%m-%d")
 
 
-def save_expenses():
-    """Save expenses to file (runs in background thread)"""
-    with open(DATA_FILE, "w") as file:
-        json.dump(expenses, file, default=str, indent=4)
-    print("✔ Expenses saved successfully.\n")
+def format_date(date: datetime) -> str:
+    """Convert datetime object to the YYYY-MM-DD text stored in the database"""
+    # Fixed width (strftime's %Y does not zero-pad years below 1000 on glibc)
+    # so the stored text sorts in date order
+    return f"{date.year:04d}-{date.month:02d}-{date.day:02d}"
+
 
+def legacy_record_to_row(exp: Dict) -> tuple:
+    """Convert an expense from the old JSON file to an insert row"""
+    # Old files saved dates with default=str ("YYYY-MM-DD 00:00:00")
+    date = parse_date(exp["date"][:10])
+    amount = float(exp["amount"])
+    category = str(exp["category"])
+    return (format_date(date), amount, category, category.lower(), str(exp["description"]))
 
-def load_expenses():
-    """Load expenses from file"""
-    global expenses
+
+def import_legacy_expenses():
+    """Copy expenses from the old JSON data file into an empty database"""
+    if not os.path.exists(LEGACY_DATA_FILE):
+        return
+    if conn.execute("SELECT 1 FROM expenses LIMIT 1").fetchone():
+        return
     try:
-        with open(DATA_FILE, "r") as file:
-            expenses = json.load(file)
-            # Convert date strings back to datetime objects
-            for exp in expenses:
-                exp["date"] = parse_date(exp["date"])
-    except FileNotFoundError:
-        expenses = []
+        with open(LEGACY_DATA_FILE, "r") as file:
+            records = json.load(file)
+    except ValueError:
+        print(f"❌ Could not read {LEGACY_DATA_FILE}; nothing imported.\n")
+        return
+
+    rows = []
+    for i, exp in enumerate(records, 1):
+        try:
+            rows.append(legacy_record_to_row(exp))
+        except (KeyError, TypeError, ValueError):
+            print(f"Skipping invalid expense {i} in {LEGACY_DATA_FILE}: {exp}")
+    with conn:
+        conn.executemany(INSERT_SQL, rows)
+    print(f"✔ Imported {len(rows)} expenses from {LEGACY_DATA_FILE}.\n")
+
+
+def data_version() -> int:
+    """Return SQLite's counter of commits made by other connections"""
+    return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def load_totals():
+    """Load the per-category and overall totals from the database"""
+    global _overall_total, _totals_version
+    _totals_version = data_version()
+    _category_totals.clear()
+    # ORDER BY MIN(id) keeps categories in first-seen order across restarts
+    for category, amount in conn.execute(
+        "SELECT category, SUM(amount) FROM expenses GROUP BY category ORDER BY MIN(id)"
+    ):
+        _category_totals[sys.intern(category)] = amount
+    _overall_total = conn.execute("SELECT TOTAL(amount) FROM expenses").fetchone()[0]
+
+
+def open_database():
+    """Open (and if needed create) the expense database"""
+    global conn
+    conn = sqlite3.connect(DB_FILE)
+    # WAL + NORMAL sync: no fsync on every commit. The database stays
+    # consistent, but the last commits can be lost on power failure.
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    import_legacy_expenses()
+    load_totals()
+
+
+def parse_expense_line(line: str) -> tuple:
+    """Convert a 'YYYY-MM-DD,amount,category,description' line to an insert row"""
+    # Split at most 3 times so the description may contain commas
+    date_str, amount, category, description = line.rstrip("\n").split(",", 3)
+    category = sys.intern(category.strip())
+    return (format_date(parse_date(date_str.strip())), float(amount), category,
+            category.lower(), description.strip())
+
+
+def insert_expenses(rows: List[tuple]):
+    """Insert rows in one transaction and update the running totals"""
+    global _overall_total
+    with conn:
+        conn.executemany(INSERT_SQL, rows)
+    for _, amount, category, _, _ in rows:
+        _category_totals[category] += amount
+        _overall_total += amount
+
+
+def print_expense(date: str, amount: float, category: str, description: str):
+    """Print one expense row"""
+    print(f"{date} | ${amount:.2f} | {category} | {description}")
+
+
+def print_category_expense(date: str, amount: float, description: str):
+    """Print one expense row from a category filter"""
+    print(f"{date} | ${amount:.2f} | {description}")
+
+
+def print_rows(rows: Iterable[tuple], empty_message: str, print_row=print_expense):
+    """Print rows straight from a cursor, without collecting them in a list"""
+    printed = False
+    for row in rows:
+        print_row(*row)
+        printed = True
+
+    if not printed:
+        print(empty_message)
+        return
+    print()
 
 
 # -----------------------------
@@ -45,22 +180,18 @@ def load_expenses():
 def add_expense():
     """Add a new expense"""
     try:
-        date = parse_date(input("Enter date (YYYY-MM-DD): "))
-        amount = float(input("Enter amount: "))
-        category = input("Enter category: ").strip()
-        description = input("Enter description: ").strip()
-
-        expense = {
-            "date": date,
-            "amount": amount,
-            "category": category,
-            "description": description
-        }
-
-        expenses.append(expense)
+        if BULK_MODE:
+            # One read per expense instead of four prompts
+            row = parse_expense_line(input("Enter expense (YYYY-MM-DD,amount,category,description): "))
+        else:
+            date = parse_date(input("Enter date (YYYY-MM-DD): "))
+            amount = float(input("Enter amount: "))
+            category = sys.intern(input("Enter category: ").strip())
+            description = input("Enter description: ").strip()
+            row = (format_date(date), amount, category, category.lower(), description)
 
-        # Save data using concurrency (non-blocking)
-        threading.Thread(target=save_expenses).start()
+        # Committed in its own transaction
+        insert_expenses([row])
 
         print("✔ Expense added successfully.\n")
 
@@ -70,33 +201,27 @@ def add_expense():
 
 def view_expenses():
     """View all expenses"""
-    if not expenses:
-        print("No expenses recorded.\n")
-        return
-
-    for exp in expenses:
-        print(
-            f"{exp['date'].date()} | "
-            f"${exp['amount']:.2f} | "
-            f"{exp['category']} | "
-            f"{exp['description']}"
-        )
-    print()
+    rows = conn.execute(
+        "SELECT date, amount, category, description FROM expenses ORDER BY id"
+    )
+    print_rows(rows, "No expenses recorded.\n")
 
 
 def filter_by_category():
     """Filter expenses by category"""
-    category = input("Enter category to filter: ").strip()
-
-    filtered = [exp for exp in expenses if exp["category"].lower() == category.lower()]
-
-    if not filtered:
-        print("No expenses found for this category.\n")
-        return
+    target = input("Enter category to filter: ").strip().lower()
 
-    for exp in filtered:
-        print(f"{exp['date'].date()} | ${exp['amount']:.2f} | {exp['description']}")
-    print()
+    # Plain equality on the pre-lowered key, served by idx_cat_key
+    filtered = conn.execute(
+        "SELECT date, amount, description FROM expenses "
+        "WHERE category_key = ? ORDER BY id",
+        (target,),
+    )
+    print_rows(
+        filtered,
+        "No expenses found for this category.\n",
+        print_category_expense,
+    )
 
 
 def filter_by_date_range():
@@ -105,49 +230,67 @@ def filter_by_date_range():
         start = parse_date(input("Start date (YYYY-MM-DD): "))
         end = parse_date(input("End date (YYYY-MM-DD): "))
 
-        filtered = [exp for exp in expenses if start <= exp["date"] <= end]
-
-        if not filtered:
-            print("No expenses found in this date range.\n")
-            return
-
-        for exp in filtered:
-            print(
-                f"{exp['date'].date()} | "
-                f"${exp['amount']:.2f} | "
-                f"{exp['category']} | "
-                f"{exp['description']}"
-            )
-        print()
+        # YYYY-MM-DD text sorts chronologically, so idx_date serves the range
+        filtered = conn.execute(
+            "SELECT date, amount, category, description FROM expenses "
+            "WHERE date BETWEEN ? AND ? ORDER BY date, id",
+            (format_date(start), format_date(end)),
+        )
+        print_rows(filtered, "No expenses found in this date range.\n")
 
     except ValueError:
         print("❌ Invalid date format.\n")
 
 
-def show_summary():
-    """Show total expenses by category and overall"""
-    category_totals: Dict[str, float] = {}
-    total = 0.0
+def import_expenses(lines: Iterable[str]):
+    """Add expenses from 'YYYY-MM-DD,amount,category,description' lines, in batches"""
+    batch: List[tuple] = []
+    imported = 0
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            batch.append(parse_expense_line(line))
+        except ValueError:
+            print(f"Skipping invalid line {line_no}: {line.strip()}")
+            continue
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            insert_expenses(batch)
+            imported += len(batch)
+            batch = []
+
+    if batch:
+        insert_expenses(batch)
+        imported += len(batch)
+    print(f"✔ Imported {imported} expenses.\n")
 
-    for exp in expenses:
-        category = exp["category"]
-        amount = exp["amount"]
-
-        category_totals[category] = category_totals.get(category, 0) + amount
-        total += amount
 
+def show_summary():
+    """Show total expenses by category and overall"""
+    # Served from the running totals, reloaded only if another process
+    # changed the database since they were loaded
+    if data_version() != _totals_version:
+        load_totals()
     print("\nExpense Summary:")
-    for category, amount in category_totals.items():
+    for category, amount in _category_totals.items():
         print(f"{category}: ${amount:.2f}")
 
-    print(f"Overall Total: ${total:.2f}\n")
+    print(f"Overall Total: ${_overall_total:.2f}\n")
 
 
 # -----------------------------
 # Main Menu
 # -----------------------------
 def main():
-    load_expenses()
+    global BULK_MODE
+    open_database()
+
+    # Stream expenses from stdin: python expense_tracker.py --import < expenses.csv
+    if "--import" in sys.argv[1:]:
+        import_expenses(sys.stdin)
+        conn.close()
+        return
+    BULK_MODE = "--bulk" in sys.argv[1:]
 
     while True:
         print("=== Expense Tracker ===")
@@ -176,6 +319,8 @@ def main():
         else:
             print("Invalid choice. Try again.\n")
 
+    conn.close()
+
 
 if __name__ == "__main__":
     main()
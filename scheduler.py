@@ -34,8 +34,8 @@ def normalize_preferences(raw_prefs: Dict[str, Dict[str, object]]) -> Preference
                 ranked = [s for s in raw if isinstance(s, str)]
             else:
                 ranked = []
-            ranked = [s.lower().strip() for s in ranked if s.lower().strip() in SHIFT_SET]
-            prefs[emp][day] = ranked
+            # Clean each name once and keep it if valid
+            prefs[emp][day] = [c for s in ranked if (c := s.lower().strip()) in SHIFT_SET]
     return prefs
 
 def empty_schedule() -> Schedule:
@@ -68,119 +68,149 @@ def schedule_employees(
     feasible_or_raise(employees, cfg)
 
     prefs = normalize_preferences(raw_preferences)
-    sched: Schedule = empty_schedule()
-    assigned_on_day: Dict[str, set] = {d: set() for d in DAYS}
-    days_worked: Dict[str, int] = {e: 0 for e in employees}
+
+    # Work on integer ids throughout: employees by position in `employees`,
+    # days and shifts by their index in DAYS / SHIFTS. Names come back at the end.
+    n_emp = len(employees)
+    shift_index = {s: si for si, s in enumerate(SHIFTS)}
+    # pref_matrix[e][di] -> ranked shift indices for employee e on day di
+    pref_matrix: List[List[List[int]]] = [
+        [[shift_index[s] for s in prefs.get(emp, {}).get(day, [])] for day in DAYS]
+        for emp in employees
+    ]
+    # slots[di][si] -> employee ids working that shift
+    slots: List[List[List[int]]] = [[[] for _ in SHIFTS] for _ in DAYS]
+    # Bitmask per day: bit e is set once employee e works a shift that day
+    assigned_on_day: List[int] = [0] * len(DAYS)
+    days_worked: List[int] = [0] * n_emp
+    max_days = cfg.max_days_per_employee
+    cap = cfg.max_per_shift if cfg.max_per_shift and cfg.max_per_shift > 0 else None
     warnings: List[str] = []
 
-    def shift_has_capacity(day: str, shift: str) -> bool:
-        if not cfg.max_per_shift or cfg.max_per_shift <= 0:
-            return True
-        return len(sched[day][shift]) < cfg.max_per_shift
+    # Forward checking: `slack` is the remaining supply (shift-days employees can
+    # still work) minus the remaining demand (seats still needed to reach min
+    # staffing). Filling a seat below the minimum leaves slack unchanged; a seat
+    # above the minimum spends one unit, and is refused once none is left so
+    # preferences cannot use up days the minimums still need.
+    min_needed = min(cfg.min_per_shift, cap) if cap is not None else cfg.min_per_shift
+    slack = n_emp * max_days - len(DAYS) * len(SHIFTS) * max(min_needed, 0)
 
-  
-    carry_over_next_day: Dict[str, List[str]] = {d: [] for d in DAYS}
+    def shift_has_capacity(di: int, si: int) -> bool:
+        return cap is None or len(slots[di][si]) < cap
 
-    for di, day in enumerate(DAYS):
-        order = carry_over_next_day[day] + [e for e in employees if e not in carry_over_next_day[day]]
+    def can_take(di: int, si: int) -> bool:
+        return shift_has_capacity(di, si) and (slack > 0 or len(slots[di][si]) < min_needed)
 
-        for rank in range(3):
-            for emp in order:
-                if emp in assigned_on_day[day]:
-                    continue
-                if days_worked[emp] >= cfg.max_days_per_employee:
-                    continue
+    def assign(di: int, si: int, e: int):
+        nonlocal slack
+        if len(slots[di][si]) >= min_needed:
+            slack -= 1
+        slots[di][si].append(e)
+        assigned_on_day[di] |= 1 << e
+        days_worked[e] += 1
 
-                ranked = prefs.get(emp, {}).get(day, [])
-                if rank >= len(ranked):
-                    continue
-                target = ranked[rank]
-                if target not in SHIFT_SET:
+    def unassign(di: int, si: int) -> int:
+        nonlocal slack
+        e = slots[di][si].pop()
+        if len(slots[di][si]) >= min_needed:
+            slack += 1
+        assigned_on_day[di] &= ~(1 << e)
+        days_worked[e] -= 1
+        return e
+
+    # Employees with days left; anyone at max_days_per_employee is pruned
+    # before the next day instead of being re-checked in every loop
+    active: List[int] = list(range(n_emp))
+    carry_over_next_day: List[List[int]] = [[] for _ in DAYS]
+    carry_over_mask: List[int] = [0] * len(DAYS)  # same employees, as a bitmask
+
+    for di in range(len(DAYS)):
+        # After pruning everyone in `order` has days left, and only gains one by
+        # being assigned today, so the loops below need not re-check max days
+        active = [e for e in active if days_worked[e] < max_days]
+        carried = carry_over_mask[di]
+        order = list(carry_over_next_day[di])
+        order.extend(e for e in active if not carried >> e & 1)
+        day_prefs = [(e, pref_matrix[e][di]) for e in order]
+
+        for rank in range(3):
+            # Only employees with a choice at this rank take part in the round
+            choices = [(e, ranked[rank]) for e, ranked in day_prefs if rank < len(ranked)]
+            for e, si in choices:
+                if assigned_on_day[di] >> e & 1:
                     continue
 
-                # Enforce 1 shift/day and capacity
-                if shift_has_capacity(day, target):
-                    sched[day][target].append(emp)
-                    assigned_on_day[day].add(emp)
-                    days_worked[emp] += 1
+                # Enforce 1 shift/day, capacity and the min-staffing forward check
+                if can_take(di, si):
+                    assign(di, si, e)
 
-        for emp in order:
-            if emp in assigned_on_day[day]:
-                continue
-            if days_worked[emp] >= cfg.max_days_per_employee:
+        for e, ranked in day_prefs:
+            if assigned_on_day[di] >> e & 1:
                 continue
 
-            if prefs.get(emp, {}).get(day):
+            if ranked:
                 placed = False
-                seen = set(prefs[emp][day])
-                for s in prefs[emp][day] + [s for s in SHIFTS if s not in seen]:
-                    if shift_has_capacity(day, s):
-                        sched[day][s].append(emp)
-                        assigned_on_day[day].add(emp)
-                        days_worked[emp] += 1
+                for si in ranked + [si for si in range(len(SHIFTS)) if si not in ranked]:
+                    if can_take(di, si):
+                        assign(di, si, e)
                         placed = True
                         break
                 if not placed:
                     if di < len(DAYS) - 1:
-                        carry_over_next_day[DAYS[di + 1]].append(emp)
+                        carry_over_next_day[di + 1].append(e)
+                        carry_over_mask[di + 1] |= 1 << e
 
-    for day in DAYS:
-        for shift in SHIFTS:
-            need = cfg.min_per_shift - len(sched[day][shift])
+    for di, day in enumerate(DAYS):
+        for si, shift in enumerate(SHIFTS):
+            need = cfg.min_per_shift - len(slots[di][si])
             if need <= 0:
                 continue
-                
-            candidates = [e for e in employees
-                          if e not in assigned_on_day[day] and days_worked[e] < cfg.max_days_per_employee]
+
+            active = [e for e in active if days_worked[e] < max_days]
+            taken = assigned_on_day[di]
+            candidates = [e for e in active if not taken >> e & 1]
             random.shuffle(candidates)
 
             added = 0
-            for emp in candidates:
-                if cfg.max_per_shift and cfg.max_per_shift > 0 and len(sched[day][shift]) >= cfg.max_per_shift:
-                    break  
-                sched[day][shift].append(emp)
-                assigned_on_day[day].add(emp)
-                days_worked[emp] += 1
+            for e in candidates:
+                if not shift_has_capacity(di, si):
+                    break
+                assign(di, si, e)
                 added += 1
                 if added >= need:
                     break
 
-            if len(sched[day][shift]) < cfg.min_per_shift:
+            if len(slots[di][si]) < cfg.min_per_shift:
                 warnings.append(
                     f"Warning: Could not meet min staffing for {day} {shift} "
-                    f"({len(sched[day][shift])}/{cfg.min_per_shift}). Consider more staff or relaxing caps."
+                    f"({len(slots[di][si])}/{cfg.min_per_shift}). Consider more staff or relaxing caps."
                 )
 
-    if cfg.max_per_shift and cfg.max_per_shift > 0:
-        for day in DAYS:
-            for shift in SHIFTS:
-                while len(sched[day][shift]) > cfg.max_per_shift:
-                    emp = sched[day][shift].pop()  
-                    assigned_on_day[day].remove(emp)
-                    days_worked[emp] -= 1
+    if cap is not None:
+        for di, day in enumerate(DAYS):
+            for si, shift in enumerate(SHIFTS):
+                while len(slots[di][si]) > cap:
+                    e = unassign(di, si)
                     placed = False
-                    for s in [s for s in SHIFTS if s != shift]:
-                        if len(sched[day][s]) < cfg.max_per_shift and emp not in assigned_on_day[day]:
-                            sched[day][s].append(emp)
-                            assigned_on_day[day].add(emp)
-                            days_worked[emp] += 1
+                    for other in range(len(SHIFTS)):
+                        if other != si and shift_has_capacity(di, other):
+                            assign(di, other, e)
                             placed = True
                             break
-                    if not placed:
-                        di = DAYS.index(day)
-                        if di < len(DAYS) - 1:
-                            next_day = DAYS[di + 1]
-                            for s in SHIFTS:
-                                if emp in assigned_on_day[next_day]:
-                                    continue
-                                if not cfg.max_per_shift or len(sched[next_day][s]) < cfg.max_per_shift:
-                                    sched[next_day][s].append(emp)
-                                    assigned_on_day[next_day].add(emp)
-                                    days_worked[emp] += 1
+                    if not placed and di < len(DAYS) - 1:
+                        if not assigned_on_day[di + 1] >> e & 1:
+                            for other in range(len(SHIFTS)):
+                                if shift_has_capacity(di + 1, other):
+                                    assign(di + 1, other, e)
                                     placed = True
                                     break
                     if not placed:
-                        warnings.append(f"Note: Could not relocate {emp} from {day} {shift}; leaving unassigned.")
+                        warnings.append(f"Note: Could not relocate {employees[e]} from {day} {shift}; leaving unassigned.")
+
+    sched: Schedule = empty_schedule()
+    for di, day in enumerate(DAYS):
+        for si, shift in enumerate(SHIFTS):
+            sched[day][shift] = [employees[e] for e in slots[di][si]]
 
     return sched, warnings
 
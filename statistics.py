@@ -1,5 +1,11 @@
 from __future__ import annotations
-from typing import Iterable, List, Dict
+from collections import Counter
+from typing import Iterable, List, Optional
+
+try:
+    import numpy as np  # optional: vectorized fast path
+except ImportError:
+    np = None
 
 
 class StatisticsCalculator:
@@ -9,20 +15,54 @@ class StatisticsCalculator:
         data_list = list(data)
         if not data_list:
             raise ValueError("data must not be empty")
-        # Ensure all items are integers (defensive)
-        for x in data_list:
-            if not isinstance(x, int):
-                raise TypeError(f"All items must be int, got {type(x).__name__}")
         self._data: List[int] = data_list
+        # Integer array for the NumPy fast path; None when NumPy is missing or
+        # the values are not a plain integer dtype (e.g. beyond 64 bits)
+        self._arr: Optional["np.ndarray"] = None
+        if np is not None:
+            try:
+                arr = np.asarray(data_list)
+            except ValueError:
+                arr = None  # ragged nested input; the loop below reports it
+            # One dtype/shape check stands in for checking every item
+            if arr is not None and arr.ndim == 1 and arr.dtype.kind in "iu":
+                self._arr = arr
+        if self._arr is None:
+            # Ensure all items are integers (defensive)
+            for x in data_list:
+                if not isinstance(x, int):
+                    raise TypeError(f"All items must be int, got {type(x).__name__}")
 
     # --- Core operations ---
 
     def mean(self) -> float:
         """Return the arithmetic mean as a float. O(n)."""
+        if self._arr is not None:
+            # Sum exactly, as sum() over Python ints does, then divide once.
+            # int64 is exact while n * max|x| cannot overflow; otherwise
+            # fall back to summing Python ints (object dtype).
+            n = self._arr.size
+            bound = max(abs(int(self._arr.min())), abs(int(self._arr.max())))
+            if bound * n < 2**63:
+                total = int(self._arr.sum(dtype=np.int64))
+            else:
+                total = int(self._arr.sum(dtype=object))
+            return total / n
         return sum(self._data) / len(self._data)
 
     def median(self) -> float:
-        """Return the median as a float. O(n log n) due to sorting."""
+        """
+        Return the median as a float. O(n) on average with NumPy (selection
+        via np.partition), otherwise O(n log n) due to sorting.
+        """
+        if self._arr is not None:
+            n = self._arr.size
+            mid = n // 2
+            if n % 2 == 1:
+                return float(np.partition(self._arr, mid)[mid])
+            p = np.partition(self._arr, [mid - 1, mid])
+            # Python ints: the sum of two int64 values may overflow
+            return (int(p[mid - 1]) + int(p[mid])) / 2.0
         s = sorted(self._data)
         n = len(s)
         mid = n // 2
@@ -36,10 +76,11 @@ class StatisticsCalculator:
         Return all mode values (sorted) as a list. O(n).
         If all values occur exactly once, every value is a mode.
         """
-        counts: Dict[int, int] = {}
-        for x in self._data:
-            counts[x] = counts.get(x, 0) + 1
-        maxf = max(counts.values())
+        if self._arr is not None:
+            vals, freqs = np.unique(self._arr, return_counts=True)  # vals sorted
+            return vals[freqs == freqs.max()].tolist()
+        counts = Counter(self._data)  # counting loop runs in C
+        maxf = counts.most_common(1)[0][1]
         return sorted([k for k, v in counts.items() if v == maxf])
 
     # --- Convenience ---